@@ -0,0 +1 @@
+"""Stress test tooling for the hospital system (generators and shared lib)."""
@@ -0,0 +1,9 @@
+"""
+Stress test generators.
+
+Each generator can be run as a module of the tests package from
+hospital_system/ (as run_test.sh does), or directly as a script from any
+directory:
+    python3 -m tests.generators.gen_stress_triage
+    python3 hospital_system/tests/generators/gen_stress_triage.py
+"""
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+gen_stress_all.py - Generate the stress test files for `run_test.sh all`.
+
+Runs the main() of each generator the runner's "all" mode injects, in
+sequence, so interpreter start-up and the hospital_utils import (constants,
+shared RNG) are paid for once instead of once per generator script.
+Appointments and pharmacy_restock are standalone tests and are not built here.
+"""
+
+import sys
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a plain script: put the directory holding the tests package on
+    # the path so the package-relative imports below resolve
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "tests.generators"
+
+from . import (
+    gen_stress_triage,
+    gen_stress_surgery,
+    gen_stress_lab_pharm,
+    gen_stress_global,
+)
+
+
+# Generators in the order the runner injects their output
+GENERATORS = (
+    gen_stress_triage.main,
+    gen_stress_surgery.main,
+    gen_stress_lab_pharm.main,
+    gen_stress_global.main,
+)
+
+
+def main():
+    """Generate the stress test files injected by the runner's all mode."""
+    for generate in GENERATORS:
+        generate()
+        print()
+
+
+if __name__ == "__main__":
+    main()
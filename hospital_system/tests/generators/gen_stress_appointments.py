@@ -7,16 +7,23 @@ the triage and consultation handling systems.
 """
 
 import sys
-import os
-import random
+from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from lib.hospital_utils import (
+if __package__ in (None, ""):
+    # Run as a plain script: put the directory holding the tests package on
+    # the path so the package-relative imports below resolve
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "tests.generators"
+
+from ..lib.hospital_utils import (
     generate_appointment, random_patient_id, generate_time_sequence,
-    write_commands_to_file, SPECIALTIES, random_tests
+    write_commands_to_file, SPECIALTIES, random_tests, rng
 )
 
+# Tests root (parent of generators/) and this generator's output file
+TESTS_DIR = Path(__file__).resolve().parent.parent
+OUTPUT_FILE = TESTS_DIR / "generated" / "stress_appointments.txt"
+
 
 def generate_appointment_stress_commands(
     num_commands: int = 75,
@@ -48,6 +55,17 @@ def generate_appointment_stress_commands(
     scheduled_slots = []
     base_scheduled_offset = 50
     
+    # Command handler validates: scheduled > current_time + init
+    # Since current_time starts at 0 and init is added, we need scheduled > init
+    min_offset = 20  # Minimum gap between init and scheduled
+    max_offset = 150 if tight_scheduling else 300
+    
+    # Pre-draw the per-appointment random decisions in bulk
+    overlaps = rng.choices(
+        (True, False), weights=(overlap_ratio, 1 - overlap_ratio), k=num_commands
+    )
+    slot_offsets = rng.choices(range(min_offset, max_offset + 1), k=num_commands)
+    
     for i in range(num_commands):
         patient_id = random_patient_id(patient_counter)
         init_time = times[i]
@@ -56,19 +74,15 @@ def generate_appointment_stress_commands(
         doctor = SPECIALTIES[i % len(SPECIALTIES)]
         
         # Determine scheduled time
-        if random.random() < overlap_ratio and scheduled_slots:
+        if overlaps[i] and scheduled_slots:
             # Reuse an existing scheduled time to create contention
-            scheduled_time = random.choice(scheduled_slots)
+            scheduled_time = rng.choice(scheduled_slots)
             # Ensure scheduled_time > init_time (validation requirement)
             if scheduled_time <= init_time:
-                scheduled_time = init_time + random.randint(20, 80)
+                scheduled_time = init_time + rng.randint(20, 80)
         else:
             # Create a new scheduled time slot
-            # Command handler validates: scheduled > current_time + init
-            # Since current_time starts at 0 and init is added, we need scheduled > init
-            min_offset = 20  # Minimum gap between init and scheduled
-            max_offset = 150 if tight_scheduling else 300
-            scheduled_time = init_time + random.randint(min_offset, max_offset)
+            scheduled_time = init_time + slot_offsets[i]
             
             # Add to slots for potential reuse
             if len(scheduled_slots) < 20:  # Limit number of tracked slots
@@ -96,25 +110,22 @@ def generate_appointment_stress_commands(
 
 def main():
     """Generate appointment stress test file."""
-    output_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_file = os.path.join(output_dir, "generated", "stress_appointments.txt")
-    
     # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    OUTPUT_FILE.parent.mkdir(exist_ok=True)
     
     commands = generate_appointment_stress_commands(
         num_commands=75,
         tight_scheduling=True,
         overlap_ratio=0.4,
-        output_file=output_file
+        output_file=OUTPUT_FILE
     )
     
     print(f"Appointment stress test: {len(commands)} commands")
     print(f"  - Tight scheduling: enabled")
     print(f"  - Overlap ratio: 0.4 (40% appointments share time slots)")
-    print(f"Output: {output_file}")
+    print(f"Output: {OUTPUT_FILE}")
     
-    return output_file
+    return OUTPUT_FILE
 
 
 if __name__ == "__main__":
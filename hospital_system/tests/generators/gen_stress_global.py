@@ -6,18 +6,25 @@ inter-module communication, and overall stability under load.
 """
 
 import sys
-import os
-import random
+from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from lib.hospital_utils import (
+if __package__ in (None, ""):
+    # Run as a plain script: put the directory holding the tests package on
+    # the path so the package-relative imports below resolve
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "tests.generators"
+
+from ..lib.hospital_utils import (
     generate_emergency, generate_appointment, generate_surgery,
     generate_lab_request, generate_pharmacy_request, generate_restock,
     generate_status, random_patient_id, random_lab_id, random_request_id,
-    generate_time_sequence, write_commands_to_file, random_bool
+    generate_time_sequence, write_commands_to_file, rng
 )
 
+# Tests root (parent of generators/) and this generator's output file
+TESTS_DIR = Path(__file__).resolve().parent.parent
+OUTPUT_FILE = TESTS_DIR / "generated" / "stress_global.txt"
+
 
 # Command type weights for distribution
 COMMAND_WEIGHTS = {
@@ -31,11 +38,13 @@ COMMAND_WEIGHTS = {
 }
 
 
-def select_command_type() -> str:
-    """Select a random command type based on weights."""
-    types = list(COMMAND_WEIGHTS.keys())
-    weights = list(COMMAND_WEIGHTS.values())
-    return random.choices(types, weights=weights)[0]
+COMMAND_TYPES = tuple(COMMAND_WEIGHTS.keys())
+COMMAND_TYPE_WEIGHTS = tuple(COMMAND_WEIGHTS.values())
+
+
+def select_command_types(count: int) -> list:
+    """Select `count` random command types based on weights, in one draw."""
+    return rng.choices(COMMAND_TYPES, weights=COMMAND_TYPE_WEIGHTS, k=count)
 
 
 def generate_global_stress_commands(
@@ -65,14 +74,15 @@ def generate_global_stress_commands(
     lab_counter = 1
     pharm_counter = 1
     
-    for i in range(num_commands):
-        init_time = times[i]
-        cmd_type = select_command_type()
+    # Draw every command type up front instead of once per iteration
+    cmd_types = select_command_types(num_commands)
+    
+    for init_time, cmd_type in zip(times, cmd_types):
         
         if cmd_type == 'EMERGENCY':
             patient_id = random_patient_id(patient_counter)
             # Under chaos, more critical patients
-            triage = random.randint(1, 3) if random_bool(chaos_level) else random.randint(1, 5)
+            triage = rng.randint(1, 3) if rng.random() < chaos_level else rng.randint(1, 5)
             cmd = generate_emergency(
                 patient_id=patient_id,
                 init_time=init_time,
@@ -83,7 +93,7 @@ def generate_global_stress_commands(
         elif cmd_type == 'APPOINTMENT':
             patient_id = random_patient_id(patient_counter)
             # Tighter scheduling under chaos
-            scheduled_offset = random.randint(20, 100) if random_bool(chaos_level) else random.randint(50, 200)
+            scheduled_offset = rng.randint(20, 100) if rng.random() < chaos_level else rng.randint(50, 200)
             cmd = generate_appointment(
                 patient_id=patient_id,
                 init_time=init_time,
@@ -94,8 +104,8 @@ def generate_global_stress_commands(
         elif cmd_type == 'SURGERY':
             patient_id = random_patient_id(patient_counter)
             # More HIGH urgency under chaos
-            urgency = "HIGH" if random_bool(chaos_level * 0.5) else None
-            scheduled_offset = random.randint(50, 150) if random_bool(chaos_level) else random.randint(100, 300)
+            urgency = "HIGH" if rng.random() < chaos_level * 0.5 else None
+            scheduled_offset = rng.randint(50, 150) if rng.random() < chaos_level else rng.randint(100, 300)
             cmd = generate_surgery(
                 patient_id=patient_id,
                 init_time=init_time,
@@ -107,7 +117,7 @@ def generate_global_stress_commands(
         elif cmd_type == 'LAB_REQUEST':
             lab_id = random_lab_id(lab_counter)
             # More URGENT under chaos
-            priority = "URGENT" if random_bool(chaos_level * 0.4) else None
+            priority = "URGENT" if rng.random() < chaos_level * 0.4 else None
             cmd = generate_lab_request(
                 lab_id=lab_id,
                 init_time=init_time,
@@ -118,9 +128,9 @@ def generate_global_stress_commands(
         elif cmd_type == 'PHARMACY_REQUEST':
             request_id = random_request_id(pharm_counter)
             # More URGENT/HIGH under chaos
-            if random_bool(chaos_level * 0.3):
+            if rng.random() < chaos_level * 0.3:
                 priority = "URGENT"
-            elif random_bool(chaos_level * 0.4):
+            elif rng.random() < chaos_level * 0.4:
                 priority = "HIGH"
             else:
                 priority = None
@@ -133,7 +143,7 @@ def generate_global_stress_commands(
             
         elif cmd_type == 'RESTOCK':
             # Larger restocks under chaos (system needs more resources)
-            quantity = random.randint(50, 150) if random_bool(chaos_level) else None
+            quantity = rng.randint(50, 150) if rng.random() < chaos_level else None
             cmd = generate_restock(quantity=quantity)
             
         elif cmd_type == 'STATUS':
@@ -155,23 +165,20 @@ def generate_global_stress_commands(
 
 def main():
     """Generate global stress test file."""
-    output_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_file = os.path.join(output_dir, "generated", "stress_global.txt")
-    
     # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    OUTPUT_FILE.parent.mkdir(exist_ok=True)
     
     commands = generate_global_stress_commands(
         num_commands=150,
         chaos_level=0.7,
-        output_file=output_file
+        output_file=OUTPUT_FILE
     )
     
     print(f"Global stress test: {len(commands)} commands")
     print(f"  - Chaos level: 0.7")
-    print(f"Output: {output_file}")
+    print(f"Output: {OUTPUT_FILE}")
     
-    return output_file
+    return OUTPUT_FILE
 
 
 if __name__ == "__main__":
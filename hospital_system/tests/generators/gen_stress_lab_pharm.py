@@ -7,18 +7,33 @@ to test concurrent processing and resource management.
 """
 
 import sys
-import os
-import random
+from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from lib.hospital_utils import (
+if __package__ in (None, ""):
+    # Run as a plain script: put the directory holding the tests package on
+    # the path so the package-relative imports below resolve
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "tests.generators"
+
+from ..lib.hospital_utils import (
     generate_lab_request, generate_pharmacy_request, generate_restock,
     random_lab_id, random_request_id, generate_time_sequence,
-    write_commands_to_file, LAB_TYPES, random_bool,
-    MEDICATIONS
+    write_commands_to_file, LAB_TYPES, LAB_PRIORITIES, PHARMACY_PRIORITIES,
+    MEDICATIONS, rng
 )
 
+# Tests root (parent of generators/) and this generator's output file
+TESTS_DIR = Path(__file__).resolve().parent.parent
+OUTPUT_FILE = TESTS_DIR / "generated" / "stress_lab_pharm.txt"
+
+# Cumulative priority weights over LAB_PRIORITIES (URGENT, NORMAL) and
+# PHARMACY_PRIORITIES (URGENT, HIGH, NORMAL), with and without URGENT.
+# Pharmacy: 25% URGENT, then 35% of the remainder HIGH
+LAB_URGENT_CUM_WEIGHTS = (0.3, 1.0)
+LAB_NORMAL_CUM_WEIGHTS = (0.0, 1.0)
+PHARM_URGENT_CUM_WEIGHTS = (0.25, 0.5125, 1.0)
+PHARM_NORMAL_CUM_WEIGHTS = (0.0, 0.35, 1.0)
+
 
 def generate_lab_pharm_stress_commands(
     num_lab_requests: int = 40,
@@ -40,28 +55,29 @@ def generate_lab_pharm_stress_commands(
     Returns:
         List of command strings
     """
-    commands = []
-    
     total_commands = num_lab_requests + num_pharm_requests + num_restocks
+    # The final size is known, so fill a preallocated list by index
+    commands = [None] * total_commands
+    cmd_idx = 0
+    
     times = generate_time_sequence(start=0, count=total_commands, max_gap=3)
     
     lab_counter = 1
     pharm_counter = 1
-    time_idx = 0
+    
+    # Distribute across lab types (drawn in one batch)
+    lab_types = rng.choices(LAB_TYPES, k=num_lab_requests)
+    
+    # Priority distribution - more urgent under stress
+    lab_priorities = rng.choices(
+        LAB_PRIORITIES,
+        cum_weights=LAB_URGENT_CUM_WEIGHTS if include_urgent else LAB_NORMAL_CUM_WEIGHTS,
+        k=num_lab_requests
+    )
     
     # Generate LAB_REQUEST commands
-    for _ in range(num_lab_requests):
+    for lab_type, priority, init_time in zip(lab_types, lab_priorities, times[:num_lab_requests]):
         lab_id = random_lab_id(lab_counter)
-        init_time = times[time_idx]
-        
-        # Distribute across lab types
-        lab_type = random.choice(LAB_TYPES)
-        
-        # Priority distribution - more urgent under stress
-        if include_urgent and random_bool(0.3):
-            priority = "URGENT"
-        else:
-            priority = "NORMAL"
         
         cmd = generate_lab_request(
             lab_id=lab_id,
@@ -70,22 +86,23 @@ def generate_lab_pharm_stress_commands(
             lab_type=lab_type
         )
         
-        commands.append(cmd)
+        commands[cmd_idx] = cmd
+        cmd_idx += 1
         lab_counter += 1
-        time_idx += 1
     
-    # Generate PHARMACY_REQUEST commands
-    for _ in range(num_pharm_requests):
+    # Generate PHARMACY_REQUEST commands (times covers every lab and
+    # pharmacy request, so the next slice never runs short)
+    pharm_times = times[num_lab_requests:num_lab_requests + num_pharm_requests]
+    
+    # Priority distribution
+    pharm_priorities = rng.choices(
+        PHARMACY_PRIORITIES,
+        cum_weights=PHARM_URGENT_CUM_WEIGHTS if include_urgent else PHARM_NORMAL_CUM_WEIGHTS,
+        k=num_pharm_requests
+    )
+    
+    for priority, init_time in zip(pharm_priorities, pharm_times):
         request_id = random_request_id(pharm_counter)
-        init_time = times[time_idx] if time_idx < len(times) else times[-1] + random.randint(1, 5)
-        
-        # Priority distribution
-        if include_urgent and random_bool(0.25):
-            priority = "URGENT"
-        elif random_bool(0.35):
-            priority = "HIGH"
-        else:
-            priority = "NORMAL"
         
         cmd = generate_pharmacy_request(
             request_id=request_id,
@@ -93,20 +110,22 @@ def generate_lab_pharm_stress_commands(
             priority=priority
         )
         
-        commands.append(cmd)
+        commands[cmd_idx] = cmd
+        cmd_idx += 1
         pharm_counter += 1
-        time_idx = min(time_idx + 1, len(times) - 1)
     
     # Generate RESTOCK commands (to replenish depleted stock)
-    for _ in range(num_restocks):
-        medication = random.choice(MEDICATIONS)
-        quantity = random.randint(50, 200)  # Larger restocks for stress test
-        
+    restock_meds = rng.choices(MEDICATIONS, k=num_restocks)
+    # Larger restocks for stress test
+    restock_quantities = rng.choices(range(50, 201), k=num_restocks)
+    
+    for medication, quantity in zip(restock_meds, restock_quantities):
         cmd = generate_restock(medication=medication, quantity=quantity)
-        commands.append(cmd)
+        commands[cmd_idx] = cmd
+        cmd_idx += 1
     
     # Shuffle to interleave lab and pharmacy requests
-    random.shuffle(commands)
+    rng.shuffle(commands)
     
     if output_file:
         write_commands_to_file(commands, output_file)
@@ -116,24 +135,21 @@ def generate_lab_pharm_stress_commands(
 
 def main():
     """Generate lab/pharmacy stress test file."""
-    output_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_file = os.path.join(output_dir, "generated", "stress_lab_pharm.txt")
-    
     # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    OUTPUT_FILE.parent.mkdir(exist_ok=True)
     
     commands = generate_lab_pharm_stress_commands(
         num_lab_requests=45,
         num_pharm_requests=45,
         num_restocks=15,
         include_urgent=True,
-        output_file=output_file
+        output_file=OUTPUT_FILE
     )
     
     print(f"Lab/Pharmacy stress test: {len(commands)} commands")
-    print(f"Output: {output_file}")
+    print(f"Output: {OUTPUT_FILE}")
     
-    return output_file
+    return OUTPUT_FILE
 
 
 if __name__ == "__main__":
@@ -19,26 +19,36 @@ Expected behavior with auto_restock=OFF:
 """
 
 import sys
-import os
-import random
+from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from lib.hospital_utils import (
-    generate_pharmacy_request, generate_restock,
+if __package__ in (None, ""):
+    # Run as a plain script: put the directory holding the tests package on
+    # the path so the package-relative imports below resolve
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "tests.generators"
+
+from ..lib.hospital_utils import (
+    generate_pharmacy_request, generate_restock, generate_status,
     random_request_id, generate_time_sequence,
-    write_commands_to_file, MEDICATIONS
+    write_commands_to_file, MEDICATIONS, rng
 )
 
+# Tests root (parent of generators/) and this generator's output file
+TESTS_DIR = Path(__file__).resolve().parent.parent
+OUTPUT_FILE = TESTS_DIR / "generated" / "stress_pharmacy_restock.txt"
+
 
 # Target medications to deplete - we'll focus on a subset to ensure depletion
-TARGET_MEDICATIONS = [
+TARGET_MEDICATIONS = (
     "ANALGESICO_A",
     "ANTIBIOTICO_B", 
     "ANESTESICO_C",
     "SEDATIVO_D",
     "ANTIINFLAMATORIO_E"
-]
+)
+
+# Pharmacy snapshot command, built once for the depletion and final checks
+STATUS_PHARMACY = generate_status("PHARMACY")
 
 
 def generate_pharmacy_restock_stress_commands(
@@ -47,10 +57,12 @@ def generate_pharmacy_restock_stress_commands(
     include_manual_restocks: bool = True,
     restock_delay: int = 50,
     output_file: str = None
-) -> list:
+) -> tuple:
     """
     Generate pharmacy stress test commands designed to deplete stock.
     
+    Nothing is printed here; the caller reports the returned phase stats.
+    
     Args:
         num_requests: Total number of PHARMACY_REQUEST commands
         qty_per_request: Quantity of each medication per request (higher = faster depletion)
@@ -59,95 +71,61 @@ def generate_pharmacy_restock_stress_commands(
         output_file: Optional file to write commands to
     
     Returns:
-        List of command strings
+        Tuple of (list of command strings, {phase: (count, label)})
     """
     commands = []
+    stats = {}
+    
+    # Bind the per-iteration lookups to locals once for all phase loops
+    choices = rng.choices
+    sample = rng.sample
+    choice = rng.choice
+    commands_append = commands.append
     
     # Phase 1: Initial burst of requests to deplete stock quickly
     # Use small time gaps to create pressure on the pharmacy
     times = generate_time_sequence(start=0, count=num_requests, max_gap=2)
     
-    print(f"=== Pharmacy Stock Depletion Stress Test ===")
-    print(f"Target medications: {TARGET_MEDICATIONS}")
-    print(f"Total requests: {num_requests}")
-    print(f"Quantity per medication: {qty_per_request}")
-    print(f"Expected behavior: Stock should run out, requests should fail/queue")
-    print()
-    
-    # Phase 1: First wave - URGENT priority to process immediately
+    # Phases 1-3: waves of requests against the same target medications.
+    # Each phase is (priority, max meds per request, request count, label).
     phase1_count = num_requests // 3
-    print(f"Phase 1: {phase1_count} URGENT requests (rapid stock depletion)")
-    
-    for i in range(phase1_count):
-        request_id = random_request_id(i + 1)
-        init_time = times[i]
-        
-        # Target 1-2 specific medications per request with high quantity
-        num_meds = random.randint(1, 2)
-        meds = random.sample(TARGET_MEDICATIONS, num_meds)
-        items = [(med, qty_per_request) for med in meds]
-        
-        cmd = generate_pharmacy_request(
-            request_id=request_id,
-            init_time=init_time,
-            priority="URGENT",
-            items=items
-        )
-        commands.append(cmd)
-    
-    # Phase 2: Second wave - HIGH priority 
     phase2_count = num_requests // 3
-    phase2_start = phase1_count
-    print(f"Phase 2: {phase2_count} HIGH priority requests (continued depletion)")
-    
-    for i in range(phase2_count):
-        idx = phase2_start + i
-        request_id = random_request_id(idx + 1)
-        init_time = times[idx] if idx < len(times) else times[-1] + i * 2
-        
-        # Target same medications
-        num_meds = random.randint(1, 3)
-        meds = random.sample(TARGET_MEDICATIONS, num_meds)
-        items = [(med, qty_per_request) for med in meds]
-        
-        cmd = generate_pharmacy_request(
-            request_id=request_id,
-            init_time=init_time,
-            priority="HIGH",
-            items=items
-        )
-        commands.append(cmd)
-    
-    # Phase 3: Third wave - NORMAL priority (these should mostly fail if stock depleted)
     phase3_count = num_requests - phase1_count - phase2_count
-    phase3_start = phase1_count + phase2_count
-    print(f"Phase 3: {phase3_count} NORMAL priority requests (expected failures if depleted)")
+    phases = (
+        # First wave - URGENT priority to process immediately
+        ("URGENT", 2, phase1_count, "URGENT requests (rapid stock depletion)"),
+        # Second wave - HIGH priority
+        ("HIGH", 3, phase2_count, "HIGH priority requests (continued depletion)"),
+        # Third wave - NORMAL priority (these should mostly fail if stock depleted)
+        ("NORMAL", 2, phase3_count, "NORMAL priority requests (expected failures if depleted)"),
+    )
     
-    for i in range(phase3_count):
-        idx = phase3_start + i
-        request_id = random_request_id(idx + 1)
-        init_time = times[idx] if idx < len(times) else times[-1] + i * 2
-        
-        # Target same medications
-        num_meds = random.randint(1, 2)
-        meds = random.sample(TARGET_MEDICATIONS, num_meds)
-        items = [(med, qty_per_request) for med in meds]
+    idx = 0
+    for phase, (priority, max_meds, count, label) in enumerate(phases, start=1):
+        stats[phase] = (count, label)
         
-        cmd = generate_pharmacy_request(
-            request_id=request_id,
-            init_time=init_time,
-            priority="NORMAL",
-            items=items
-        )
-        commands.append(cmd)
+        # Target 1..max_meds specific medications per request with high
+        # quantity; the per-request counts are drawn in one batch
+        for num_meds in choices(range(1, max_meds + 1), k=count):
+            meds = sample(TARGET_MEDICATIONS, num_meds)
+            items = [(med, qty_per_request) for med in meds]
+            
+            cmd = generate_pharmacy_request(
+                request_id=random_request_id(idx + 1),
+                init_time=times[idx],
+                priority=priority,
+                items=items
+            )
+            commands_append(cmd)
+            idx += 1
     
     # Add STATUS command to see pharmacy state after depletion
     last_request_time = times[-1] if times else num_requests * 2
-    commands.append(f"STATUS PHARMACY")
+    commands_append(STATUS_PHARMACY)
     
     # Phase 4: Optional manual restocks to test recovery
     if include_manual_restocks:
-        print(f"Phase 4: Manual RESTOCK commands after delay")
+        stats[4] = (len(TARGET_MEDICATIONS), "manual RESTOCK commands after delay")
         restock_time = last_request_time + restock_delay
         
         for med in TARGET_MEDICATIONS:
@@ -156,15 +134,16 @@ def generate_pharmacy_restock_stress_commands(
                 medication=med,
                 quantity=50
             )
-            commands.append(cmd)
+            commands_append(cmd)
         
         # Add more requests after restock to verify recovery
-        print(f"Phase 5: Post-restock requests to verify recovery")
-        for i in range(10):
+        num_post_restock = 10
+        stats[5] = (num_post_restock, "post-restock requests to verify recovery")
+        for i in range(num_post_restock):
             request_id = random_request_id(num_requests + i + 1)
             init_time = restock_time + 10 + i * 3
             
-            med = random.choice(TARGET_MEDICATIONS)
+            med = choice(TARGET_MEDICATIONS)
             items = [(med, 3)]  # Small quantity
             
             cmd = generate_pharmacy_request(
@@ -173,40 +152,46 @@ def generate_pharmacy_restock_stress_commands(
                 priority="NORMAL",
                 items=items
             )
-            commands.append(cmd)
+            commands_append(cmd)
         
         # Final status check
-        commands.append(f"STATUS PHARMACY")
-    
-    print()
-    print(f"Total commands generated: {len(commands)}")
+        commands_append(STATUS_PHARMACY)
     
     # Write to file
     if output_file:
         write_commands_to_file(commands, output_file)
     
-    return commands
+    return commands, stats
 
 
 def main():
     """Generate the pharmacy restock stress test file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    tests_dir = os.path.dirname(script_dir)
-    output_dir = os.path.join(tests_dir, "generated")
-    os.makedirs(output_dir, exist_ok=True)
+    OUTPUT_FILE.parent.mkdir(exist_ok=True)
     
-    output_file = os.path.join(output_dir, "stress_pharmacy_restock.txt")
+    # Settings that should quickly deplete stock
+    num_requests = 80              # 80 pharmacy requests
+    qty_per_request = 5            # 5 units per medication per request
     
-    # Generate with settings that should quickly deplete stock
-    commands = generate_pharmacy_restock_stress_commands(
-        num_requests=80,           # 80 pharmacy requests
-        qty_per_request=5,         # 5 units per medication per request
+    commands, stats = generate_pharmacy_restock_stress_commands(
+        num_requests=num_requests,
+        qty_per_request=qty_per_request,
         include_manual_restocks=True,
         restock_delay=50,
-        output_file=output_file
+        output_file=OUTPUT_FILE
     )
     
-    print(f"\nOutput written to: {output_file}")
+    print("=== Pharmacy Stock Depletion Stress Test ===")
+    print(f"Target medications: {list(TARGET_MEDICATIONS)}")
+    print(f"Total requests: {num_requests}")
+    print(f"Quantity per medication: {qty_per_request}")
+    print("Expected behavior: Stock should run out, requests should fail/queue")
+    print()
+    for phase, (count, label) in stats.items():
+        print(f"Phase {phase}: {count} {label}")
+    print()
+    print(f"Total commands generated: {len(commands)}")
+    
+    print(f"\nOutput written to: {OUTPUT_FILE}")
     print("\n=== How to interpret results ===")
     print("With auto_restock=OFF:")
     print("  - Early requests should succeed")
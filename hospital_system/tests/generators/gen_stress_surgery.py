@@ -7,17 +7,28 @@ Operating Rooms and medical teams.
 """
 
 import sys
-import os
-import random
+from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from lib.hospital_utils import (
+if __package__ in (None, ""):
+    # Run as a plain script: put the directory holding the tests package on
+    # the path so the package-relative imports below resolve
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "tests.generators"
+
+from ..lib.hospital_utils import (
     generate_surgery, random_patient_id, generate_time_sequence,
     write_commands_to_file, SPECIALTIES, URGENCY_LEVELS,
-    random_tests, random_medications
+    random_tests, random_medications, rng
 )
 
+# Tests root (parent of generators/) and this generator's output file
+TESTS_DIR = Path(__file__).resolve().parent.parent
+OUTPUT_FILE = TESTS_DIR / "generated" / "stress_surgery.txt"
+
+# Cumulative urgency weights over URGENCY_LEVELS (LOW 0.25, MEDIUM 0.35,
+# HIGH 0.40) - biased toward higher urgency for stress
+URGENCY_CUM_WEIGHTS = (0.25, 0.60, 1.00)
+
 
 def generate_surgery_stress_commands(
     num_commands: int = 35,
@@ -45,6 +56,16 @@ def generate_surgery_stress_commands(
     # Track scheduled times to create contention
     base_scheduled = 100
     
+    # Pre-draw the scheduling offsets in one batch
+    offset_range = range(80, 201) if stagger_scheduling else range(100, 301)
+    scheduled_offsets = rng.choices(offset_range, k=num_commands)
+    
+    # Vary urgency with bias toward higher urgency for stress
+    urgencies = rng.choices(URGENCY_LEVELS, cum_weights=URGENCY_CUM_WEIGHTS, k=num_commands)
+    
+    # Bind the per-iteration lookups to locals
+    commands_append = commands.append
+    
     for i in range(num_commands):
         patient_id = random_patient_id(patient_counter)
         init_time = times[i]
@@ -52,21 +73,12 @@ def generate_surgery_stress_commands(
         # Cycle through surgery types to test all operating rooms
         surgery_type = SPECIALTIES[i % len(SPECIALTIES)]
         
-        # Vary urgency with bias toward higher urgency for stress
-        urgency_weights = [0.4, 0.35, 0.25]  # HIGH, MEDIUM, LOW
-        urgency = random.choices(URGENCY_LEVELS, weights=[0.25, 0.35, 0.40])[0]
-        
         # Schedule surgeries with overlapping times to create queue pressure
-        if stagger_scheduling:
+        if stagger_scheduling and i % 3 == 0:
             # Group surgeries to compete for same time slots
-            scheduled_offset = random.randint(80, 200)
-            if i % 3 == 0:
-                # Some surgeries scheduled at same time
-                scheduled_time = base_scheduled + (i // 3) * 50
-            else:
-                scheduled_time = init_time + scheduled_offset
+            scheduled_time = base_scheduled + (i // 3) * 50
         else:
-            scheduled_time = init_time + random.randint(100, 300)
+            scheduled_time = init_time + scheduled_offsets[i]
         
         # Always include PREOP + random additional tests
         tests = random_tests(min_count=1, max_count=3, force_preop=True)
@@ -79,12 +91,12 @@ def generate_surgery_stress_commands(
             init_time=init_time,
             surgery_type=surgery_type,
             scheduled_time=scheduled_time,
-            urgency=urgency,
+            urgency=urgencies[i],
             tests=tests,
             meds=meds
         )
         
-        commands.append(cmd)
+        commands_append(cmd)
         patient_counter += 1
     
     if output_file:
@@ -95,22 +107,19 @@ def generate_surgery_stress_commands(
 
 def main():
     """Generate surgery stress test file."""
-    output_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_file = os.path.join(output_dir, "generated", "stress_surgery.txt")
-    
     # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    OUTPUT_FILE.parent.mkdir(exist_ok=True)
     
     commands = generate_surgery_stress_commands(
         num_commands=35,
         stagger_scheduling=True,
-        output_file=output_file
+        output_file=OUTPUT_FILE
     )
     
     print(f"Surgery stress test: {len(commands)} commands")
-    print(f"Output: {output_file}")
+    print(f"Output: {OUTPUT_FILE}")
     
-    return output_file
+    return OUTPUT_FILE
 
 
 if __name__ == "__main__":
@@ -7,17 +7,28 @@ to saturate the triage simultaneous patient handling.
 """
 
 import sys
-import os
-import random
+from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from lib.hospital_utils import (
-    generate_emergency, generate_appointment,
+if __package__ in (None, ""):
+    # Run as a plain script: put the directory holding the tests package on
+    # the path so the package-relative imports below resolve
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "tests.generators"
+
+from ..lib.hospital_utils import (
+    generate_emergency_batch, generate_appointment,
     random_patient_id, generate_time_sequence,
-    write_commands_to_file, random_bool
+    write_commands_to_file, rng
 )
 
+# Tests root (parent of generators/) and this generator's output file
+TESTS_DIR = Path(__file__).resolve().parent.parent
+OUTPUT_FILE = TESTS_DIR / "generated" / "stress_triage.txt"
+
+
+# Triage levels to draw from - repeated entries bias toward urgent patients
+TRIAGE_LEVEL_POOL = (1, 1, 2, 2, 3, 4, 5)
+
 
 def generate_triage_stress_commands(
     num_commands: int = 60,
@@ -43,43 +54,54 @@ def generate_triage_stress_commands(
     max_gap = 2 if tight_timing else 10
     times = generate_time_sequence(start=0, count=num_commands, max_gap=max_gap)
     
-    patient_counter = 1
+    # One patient per command, numbered in command order
+    patient_ids = [random_patient_id(i) for i in range(1, num_commands + 1)]
+    
+    # Pre-draw the command mix and each command's random fields in bulk
+    is_emergency = rng.choices(
+        (True, False), weights=(emergency_ratio, 1 - emergency_ratio), k=num_commands
+    )
+    num_emergencies = sum(is_emergency)
+    num_appointments = num_commands - num_emergencies
+    scheduled_offsets = iter(rng.choices(range(30, 151), k=num_appointments))
+    
+    # Generate every EMERGENCY in one batch, in command order
+    emergency_slots = [i for i in range(num_commands) if is_emergency[i]]
+    emergencies = iter(generate_emergency_batch(
+        patient_ids=[patient_ids[i] for i in emergency_slots],
+        init_times=[times[i] for i in emergency_slots],
+        # Vary triage levels to test priority handling
+        triages=rng.choices(TRIAGE_LEVEL_POOL, k=num_emergencies),
+        # Some near critical threshold
+        stabilities=rng.choices(range(100, 801), k=num_emergencies)
+    ))
     
     for i in range(num_commands):
-        patient_id = random_patient_id(patient_counter)
-        init_time = times[i]
-        
-        if random_bool(emergency_ratio):
-            # Generate EMERGENCY - vary triage levels to test priority handling
-            triage_level = random.choice([1, 1, 2, 2, 3, 4, 5])  # Bias toward urgent
-            stability = random.randint(100, 800)  # Some near critical threshold
-            
-            cmd = generate_emergency(
-                patient_id=patient_id,
-                init_time=init_time,
-                triage=triage_level,
-                stability=stability
-            )
+        if is_emergency[i]:
+            # Next batched EMERGENCY, built for this slot's patient and time
+            cmd = next(emergencies)
         else:
             # Generate APPOINTMENT - scheduled for various future times
-            scheduled_offset = random.randint(30, 150)
+            init_time = times[i]
+            scheduled_offset = next(scheduled_offsets)
             
             cmd = generate_appointment(
-                patient_id=patient_id,
+                patient_id=patient_ids[i],
                 init_time=init_time,
                 scheduled_time=init_time + scheduled_offset
             )
         
         commands.append(cmd)
-        patient_counter += 1
     
     # Shuffle slightly to mix emergencies and appointments
     # But keep general time ordering
     if num_commands > 10:
+        rand = rng.random
         for i in range(0, num_commands - 5, 5):
-            chunk = commands[i:i+5]
-            random.shuffle(chunk)
-            commands[i:i+5] = chunk
+            # In-place Fisher-Yates over commands[i:i+5] (no slice copies)
+            for j in range(4, 0, -1):
+                k = i + int(rand() * (j + 1))
+                commands[i + j], commands[k] = commands[k], commands[i + j]
     
     if output_file:
         write_commands_to_file(commands, output_file)
@@ -89,23 +111,20 @@ def generate_triage_stress_commands(
 
 def main():
     """Generate triage stress test file."""
-    output_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_file = os.path.join(output_dir, "generated", "stress_triage.txt")
-    
     # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    OUTPUT_FILE.parent.mkdir(exist_ok=True)
     
     commands = generate_triage_stress_commands(
         num_commands=60,
         emergency_ratio=0.65,
         tight_timing=True,
-        output_file=output_file
+        output_file=OUTPUT_FILE
     )
     
     print(f"Triage stress test: {len(commands)} commands")
-    print(f"Output: {output_file}")
+    print(f"Output: {OUTPUT_FILE}")
     
-    return output_file
+    return OUTPUT_FILE
 
 
 if __name__ == "__main__":
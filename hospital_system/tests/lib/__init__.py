@@ -0,0 +1 @@
+"""Shared helpers for the hospital stress test generators."""
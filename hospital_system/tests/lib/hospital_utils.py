@@ -6,50 +6,80 @@ Provides data constants and helper functions for generating valid/invalid
 test commands based on the system's configuration.
 """
 
+import os
 import random
-from typing import List, Optional
+from itertools import accumulate
+from typing import List, Optional, Union
 
 # ============================================================================
 # SYSTEM DATA CONSTANTS (from config.cfg and command_handler.c)
 # ============================================================================
 
 # Valid medications (must match config.cfg and pharmacy SHM)
-MEDICATIONS = [
+MEDICATIONS = (
     "ANALGESICO_A", "ANTIBIOTICO_B", "ANESTESICO_C", "SEDATIVO_D",
     "ANTIINFLAMATORIO_E", "CARDIOVASCULAR_F", "NEUROLOGICO_G", "ORTOPEDICO_H",
     "HEMOSTATIC_I", "ANTICOAGULANTE_J", "INSULINA_K", "ANALGESICO_FORTE_L",
     "ANTIBIOTICO_FORTE_M", "VITAMINA_N", "SUPLEMENTO_O"
-]
+)
+_N_MEDS = len(MEDICATIONS)
 
 # Lab tests by laboratory capability
-TESTS_LAB1 = ["HEMO", "GLIC"]               # Hematology lab
-TESTS_LAB2 = ["COLEST", "RENAL", "HEPAT"]   # Biochemistry lab
-TESTS_ALL = TESTS_LAB1 + TESTS_LAB2 + ["PREOP"]  # PREOP requires BOTH labs
+TESTS_LAB1 = ("HEMO", "GLIC")               # Hematology lab
+TESTS_LAB2 = ("COLEST", "RENAL", "HEPAT")   # Biochemistry lab
+TESTS_NO_PREOP = TESTS_LAB1 + TESTS_LAB2
+TESTS_ALL = TESTS_NO_PREOP + ("PREOP",)     # PREOP requires BOTH labs
+
+# Hash-based compatibility checks for tests handed to generate_lab_request
+_LAB_COMPATIBLE_TESTS = {
+    "LAB1": frozenset(TESTS_LAB1),
+    "LAB2": frozenset(TESTS_LAB2),
+}
 
 # Doctor specialties / Surgery types (used by SURGERY and APPOINTMENT)
-SPECIALTIES = ["CARDIO", "ORTHO", "NEURO"]
+SPECIALTIES = ("CARDIO", "ORTHO", "NEURO")
 
 # Urgency levels for surgery
-URGENCY_LEVELS = ["LOW", "MEDIUM", "HIGH"]
+URGENCY_LEVELS = ("LOW", "MEDIUM", "HIGH")
 
 # Priority levels
-PHARMACY_PRIORITIES = ["URGENT", "HIGH", "NORMAL"]
-LAB_PRIORITIES = ["URGENT", "NORMAL"]
+PHARMACY_PRIORITIES = ("URGENT", "HIGH", "NORMAL")
+LAB_PRIORITIES = ("URGENT", "NORMAL")
 
 # Lab identifiers
-LAB_TYPES = ["LAB1", "LAB2", "BOTH"]
+LAB_TYPES = ("LAB1", "LAB2", "BOTH")
 
 # Status command components
-STATUS_COMPONENTS = ["ALL", "TRIAGE", "SURGERY", "PHARMACY", "LAB"]
+STATUS_COMPONENTS = ("ALL", "TRIAGE", "SURGERY", "PHARMACY", "LAB")
 
 
 # ============================================================================
 # RANDOM DATA GENERATORS
 # ============================================================================
 
-def random_bool(probability: float = 0.5) -> bool:
+# Shared generator instance used by every helper below and by the stress
+# generators (instead of the module-level random.* functions). Set the
+# HOSPITAL_SEED environment variable to make a run reproducible: integers
+# seed as numbers, any other string (e.g. "abc") seeds from its text.
+_seed = os.environ.get("HOSPITAL_SEED") or None
+try:
+    _seed = int(_seed) if _seed is not None else None
+except ValueError:
+    pass
+rng = random.Random(_seed)
+
+# Bound methods of rng, so the helpers skip the attribute lookup per call
+# (rng.seed() still applies, as these share its state)
+_randint = rng.randint
+_choice = rng.choice
+_sample = rng.sample
+_choices = rng.choices
+
+
+def random_bool(probability: float = 0.5, _random=rng.random) -> bool:
     """Return True with the given probability (0.0 to 1.0)."""
-    return random.random() < probability
+    # _random is bound at definition time so each call is a local lookup
+    return _random() < probability
 
 
 def random_patient_id(index: int) -> str:
@@ -67,7 +97,12 @@ def random_lab_id(index: int) -> str:
     return f"LAB{index:03d}"
 
 
-def random_medications(count: Optional[int] = None, min_count: int = 0, max_count: int = 5) -> List[str]:
+def random_medications(
+    count: Optional[int] = None,
+    min_count: int = 0,
+    max_count: int = 5,
+    as_string: bool = False
+) -> Union[List[str], str]:
     """
     Generate a random list of valid medications.
     
@@ -75,16 +110,19 @@ def random_medications(count: Optional[int] = None, min_count: int = 0, max_coun
         count: Exact count (overrides min/max if provided)
         min_count: Minimum number of medications
         max_count: Maximum number of medications
+        as_string: Return the format_list() body instead of a list
     
     Returns:
-        List of medication names
+        List of medication names (or their joined body with as_string)
     """
     if count is not None:
-        k = min(count, len(MEDICATIONS))
+        k = min(count, _N_MEDS)
     else:
-        k = random.randint(min_count, min(max_count, len(MEDICATIONS)))
+        k = _randint(min_count, min(max_count, _N_MEDS))
     
-    return random.sample(MEDICATIONS, k) if k > 0 else []
+    if as_string:
+        return ",".join(_sample(MEDICATIONS, k)) if k > 0 else ""
+    return _sample(MEDICATIONS, k) if k > 0 else []
 
 
 def random_tests(
@@ -93,8 +131,9 @@ def random_tests(
     max_count: int = 3,
     force_preop: bool = False,
     exclude_preop: bool = False,
-    lab_compatible: Optional[str] = None
-) -> List[str]:
+    lab_compatible: Optional[str] = None,
+    as_string: bool = False
+) -> Union[List[str], str]:
     """
     Generate a random list of valid tests.
     
@@ -105,33 +144,33 @@ def random_tests(
         force_preop: Always include PREOP test
         exclude_preop: Never include PREOP test
         lab_compatible: Restrict to tests compatible with LAB1/LAB2/BOTH
+        as_string: Return the format_list() body instead of a list
     
     Returns:
-        List of test names
+        List of test names (or their joined body with as_string)
     """
-    # Determine available pool
+    # Determine available pool (sample() never mutates it, so no copy)
     if lab_compatible == "LAB1":
-        pool = TESTS_LAB1.copy()
+        pool = TESTS_LAB1
     elif lab_compatible == "LAB2":
-        pool = TESTS_LAB2.copy()
+        pool = TESTS_LAB2
+    elif exclude_preop:
+        pool = TESTS_NO_PREOP
     else:
-        pool = TESTS_ALL.copy()
-    
-    if exclude_preop and "PREOP" in pool:
-        pool.remove("PREOP")
+        pool = TESTS_ALL
     
     # Determine count
     if count is not None:
         k = min(count, len(pool))
     else:
-        k = random.randint(min_count, min(max_count, len(pool)))
+        k = _randint(min_count, min(max_count, len(pool)))
     
-    tests = random.sample(pool, k) if k > 0 else []
+    tests = _sample(pool, k) if k > 0 else []
     
     if force_preop and "PREOP" not in tests:
         tests.append("PREOP")
     
-    return tests
+    return ",".join(tests) if as_string else tests
 
 
 def random_med_quantities(
@@ -139,46 +178,50 @@ def random_med_quantities(
     min_count: int = 1,
     max_count: int = 5,
     min_qty: int = 1,
-    max_qty: int = 10
-) -> List[tuple]:
+    max_qty: int = 10,
+    as_string: bool = False
+) -> Union[List[tuple], str]:
     """
     Generate random medication:quantity pairs.
     
     Returns:
-        List of (medication_name, quantity) tuples
+        List of (medication_name, quantity) tuples, or their
+        format_med_qty_list() body with as_string
     """
     meds = random_medications(count, min_count, max_count)
-    return [(med, random.randint(min_qty, max_qty)) for med in meds]
+    quantities = _choices(range(min_qty, max_qty + 1), k=len(meds))
+    pairs = list(zip(meds, quantities))
+    return format_med_qty_list(pairs) if as_string else pairs
 
 
 def random_specialty() -> str:
     """Return a random doctor specialty / surgery type."""
-    return random.choice(SPECIALTIES)
+    return _choice(SPECIALTIES)
 
 
 def random_urgency() -> str:
     """Return a random urgency level."""
-    return random.choice(URGENCY_LEVELS)
+    return _choice(URGENCY_LEVELS)
 
 
 def random_pharmacy_priority() -> str:
     """Return a random pharmacy priority."""
-    return random.choice(PHARMACY_PRIORITIES)
+    return _choice(PHARMACY_PRIORITIES)
 
 
 def random_lab_priority() -> str:
     """Return a random lab priority."""
-    return random.choice(LAB_PRIORITIES)
+    return _choice(LAB_PRIORITIES)
 
 
 def random_lab_type() -> str:
     """Return a random lab type."""
-    return random.choice(LAB_TYPES)
+    return _choice(LAB_TYPES)
 
 
 def random_triage_level() -> int:
     """Return a valid triage priority (1-5, where 1 is most urgent)."""
-    return random.randint(1, 5)
+    return _randint(1, 5)
 
 
 def random_stability(critical_threshold: int = 50) -> int:
@@ -186,21 +229,39 @@ def random_stability(critical_threshold: int = 50) -> int:
     Return a random stability value.
     Values below critical_threshold trigger critical patient handling.
     """
-    return random.randint(100, 1000)
+    return _randint(100, 1000)
 
 
 # ============================================================================
 # COMMAND FORMATTERS
 # ============================================================================
 
+# The formatters return the bare comma-joined body; the command templates
+# below supply the surrounding brackets so each command is one f-string
+
 def format_list(items: List[str]) -> str:
-    """Format a list for command syntax: [item1,item2,...]"""
-    return "[" + ",".join(items) + "]"
+    """Format a list body for command syntax: item1,item2,..."""
+    return ",".join(items)
+
+
+# Pre-built "MED:" prefixes and quantity strings for format_med_qty_list
+# (restock quantities top out at 200, so 0-255 covers every generator)
+_MED_COLON = {med: med + ":" for med in MEDICATIONS}
+_QTY_STR = {qty: str(qty) for qty in range(256)}
 
 
 def format_med_qty_list(items: List[tuple]) -> str:
-    """Format medication:quantity list: [med1:qty1,med2:qty2,...]"""
-    return "[" + ",".join(f"{med}:{qty}" for med, qty in items) + "]"
+    """Format medication:quantity list body: med1:qty1,med2:qty2,..."""
+    try:
+        # The table is keyed by int, and 5.0 / True hash equal to 5 / 1, so
+        # anything but a real int keeps its own str() form
+        return ",".join([
+            _MED_COLON[med] + (_QTY_STR[qty] if type(qty) is int else str(qty))
+            for med, qty in items
+        ])
+    except KeyError:
+        # Unknown medication or out-of-table quantity
+        return ",".join([med + ":" + str(qty) for med, qty in items])
 
 
 # ============================================================================
@@ -223,18 +284,20 @@ def generate_emergency(
     """
     triage = triage if triage is not None else random_triage_level()
     stability = stability if stability is not None else random_stability()
-    tests = tests if tests is not None else random_tests(max_count=3, exclude_preop=True)
-    meds = meds if meds is not None else random_medications(max_count=3)
-    
-    parts = [
-        f"EMERGENCY {patient_id}",
-        f"init: {init_time}",
-        f"triage: {triage}",
-        f"stability: {stability}",
-        f"tests: {format_list(tests)}",
-        f"meds: {format_list(meds)}"
-    ]
-    return " ".join(parts)
+    # Self-generated lists come back already joined
+    if tests is None:
+        tests_str = random_tests(max_count=3, exclude_preop=True, as_string=True)
+    else:
+        tests_str = format_list(tests)
+    if meds is None:
+        meds_str = random_medications(max_count=3, as_string=True)
+    else:
+        meds_str = format_list(meds)
+    
+    return (
+        f"EMERGENCY {patient_id} init: {init_time} triage: {triage} "
+        f"stability: {stability} tests: [{tests_str}] meds: [{meds_str}]"
+    )
 
 
 def generate_appointment(
@@ -254,22 +317,21 @@ def generate_appointment(
     """
     # Ensure scheduled_time > init_time (command_handler validates: scheduled > current_time + init)
     if scheduled_time is None:
-        scheduled_time = init_time + random.randint(50, 200)
+        scheduled_time = init_time + _randint(50, 200)
     elif scheduled_time <= init_time:
         # Fix invalid scheduled_time by adding minimum offset
-        scheduled_time = init_time + max(1, random.randint(20, 100))
+        scheduled_time = init_time + max(1, _randint(20, 100))
     
     doctor = doctor if doctor is not None else random_specialty()
-    tests = tests if tests is not None else random_tests(max_count=2, exclude_preop=True)
-    
-    parts = [
-        f"APPOINTMENT {patient_id}",
-        f"init: {init_time}",
-        f"scheduled: {scheduled_time}",
-        f"doctor: {doctor}",
-        f"tests: {format_list(tests)}"
-    ]
-    return " ".join(parts)
+    if tests is None:
+        tests_str = random_tests(max_count=2, exclude_preop=True, as_string=True)
+    else:
+        tests_str = format_list(tests)
+    
+    return (
+        f"APPOINTMENT {patient_id} init: {init_time} scheduled: {scheduled_time} "
+        f"doctor: {doctor} tests: [{tests_str}]"
+    )
 
 
 def generate_surgery(
@@ -295,35 +357,35 @@ def generate_surgery(
     
     # Ensure scheduled_time >= init_time (command_handler validates: scheduled >= init)
     if scheduled_time is None:
-        scheduled_time = init_time + random.randint(100, 300)
+        scheduled_time = init_time + _randint(100, 300)
     elif scheduled_time < init_time:
         # Fix invalid scheduled_time by adding minimum offset
-        scheduled_time = init_time + random.randint(50, 150)
+        scheduled_time = init_time + _randint(50, 150)
     
     urgency = urgency if urgency is not None else random_urgency()
     
     # Always include PREOP test (required for surgery)
     if tests is None:
-        tests = random_tests(min_count=1, max_count=3, force_preop=True)
+        tests_str = random_tests(min_count=1, max_count=3, force_preop=True, as_string=True)
     elif "PREOP" not in tests:
-        tests = list(tests) + ["PREOP"]
+        # Append PREOP to the joined body rather than to a copy of the list
+        tests_str = format_list(tests) + ",PREOP" if tests else "PREOP"
+    else:
+        tests_str = format_list(tests)
     
     # Ensure at least 1 medication (required for surgery)
     if meds is None:
-        meds = random_medications(min_count=1, max_count=4)
+        meds_str = random_medications(min_count=1, max_count=4, as_string=True)
     elif len(meds) == 0:
-        meds = random_medications(min_count=1, max_count=3)
-    
-    parts = [
-        f"SURGERY {patient_id}",
-        f"init: {init_time}",
-        f"type: {surgery_type}",
-        f"scheduled: {scheduled_time}",
-        f"urgency: {urgency}",
-        f"tests: {format_list(tests)}",
-        f"meds: {format_list(meds)}"
-    ]
-    return " ".join(parts)
+        meds_str = random_medications(min_count=1, max_count=3, as_string=True)
+    else:
+        meds_str = format_list(meds)
+    
+    return (
+        f"SURGERY {patient_id} init: {init_time} type: {surgery_type} "
+        f"scheduled: {scheduled_time} urgency: {urgency} "
+        f"tests: [{tests_str}] meds: [{meds_str}]"
+    )
 
 
 def generate_lab_request(
@@ -349,33 +411,24 @@ def generate_lab_request(
     
     # Generate or validate tests for lab compatibility
     if tests is None:
-        tests = random_tests(min_count=1, max_count=3, lab_compatible=lab_type)
+        # min_count=1 over a non-empty pool, so never empty
+        tests_str = random_tests(min_count=1, max_count=3, lab_compatible=lab_type, as_string=True)
     else:
-        # Validate provided tests are compatible with lab_type
-        if lab_type == "LAB1":
-            valid_tests = [t for t in tests if t in TESTS_LAB1]
-            if not valid_tests:
-                valid_tests = random_tests(min_count=1, max_count=2, lab_compatible="LAB1")
-            tests = valid_tests
-        elif lab_type == "LAB2":
-            valid_tests = [t for t in tests if t in TESTS_LAB2]
-            if not valid_tests:
-                valid_tests = random_tests(min_count=1, max_count=2, lab_compatible="LAB2")
-            tests = valid_tests
-        # BOTH accepts any tests
-    
-    # Ensure at least one test (required)
-    if not tests:
-        tests = random_tests(min_count=1, max_count=2, lab_compatible=lab_type)
-    
-    parts = [
-        f"LAB_REQUEST {lab_id}",
-        f"init: {init_time}",
-        f"priority: {priority}",
-        f"lab: {lab_type}",
-        f"tests: {format_list(tests)}"
-    ]
-    return " ".join(parts)
+        # Validate provided tests are compatible with lab_type, keeping their
+        # order (BOTH accepts any tests)
+        compatible = _LAB_COMPATIBLE_TESTS.get(lab_type)
+        if compatible is not None:
+            tests = [t for t in tests if t in compatible]
+        
+        # Ensure at least one test (required); also covers all-incompatible
+        if not tests:
+            tests = random_tests(min_count=1, max_count=2, lab_compatible=lab_type)
+        tests_str = format_list(tests)
+    
+    return (
+        f"LAB_REQUEST {lab_id} init: {init_time} priority: {priority} "
+        f"lab: {lab_type} tests: [{tests_str}]"
+    )
 
 
 def generate_pharmacy_request(
@@ -391,15 +444,15 @@ def generate_pharmacy_request(
             items: <med1:qty1,med2:qty2,...>
     """
     priority = priority if priority is not None else random_pharmacy_priority()
-    items = items if items is not None else random_med_quantities(min_count=1, max_count=5)
+    if items is None:
+        items_str = random_med_quantities(min_count=1, max_count=5, as_string=True)
+    else:
+        items_str = format_med_qty_list(items)
     
-    parts = [
-        f"PHARMACY_REQUEST {request_id}",
-        f"init: {init_time}",
-        f"priority: {priority}",
-        f"items: {format_med_qty_list(items)}"
-    ]
-    return " ".join(parts)
+    return (
+        f"PHARMACY_REQUEST {request_id} init: {init_time} priority: {priority} "
+        f"items: [{items_str}]"
+    )
 
 
 def generate_restock(medication: Optional[str] = None, quantity: Optional[int] = None) -> str:
@@ -408,8 +461,8 @@ def generate_restock(medication: Optional[str] = None, quantity: Optional[int] =
     
     Syntax: RESTOCK <medication_name> quantity: <amount>
     """
-    medication = medication if medication is not None else random.choice(MEDICATIONS)
-    quantity = quantity if quantity is not None else random.randint(10, 100)
+    medication = medication if medication is not None else _choice(MEDICATIONS)
+    quantity = quantity if quantity is not None else _randint(10, 100)
     
     return f"RESTOCK {medication} quantity: {quantity}"
 
@@ -420,7 +473,7 @@ def generate_status(component: Optional[str] = None) -> str:
     
     Syntax: STATUS <component>
     """
-    component = component if component is not None else random.choice(STATUS_COMPONENTS)
+    component = component if component is not None else _choice(STATUS_COMPONENTS)
     return f"STATUS {component}"
 
 
@@ -428,14 +481,63 @@ def generate_status(component: Optional[str] = None) -> str:
 # BATCH COMMAND UTILITIES
 # ============================================================================
 
+# Commands encoded per write in write_commands_to_file (~1 MiB of typical
+# 60-80 byte commands), bounding the payload copy on very large lists
+_WRITE_CHUNK_COMMANDS = 16384
+
+
 def write_commands_to_file(commands: List[str], filepath: str) -> None:
     """Write a list of commands to a file, one per line."""
-    with open(filepath, 'w') as f:
-        for cmd in commands:
-            f.write(cmd + '\n')
+    # Encode each chunk's joined payload once and hand it to the binary file
+    # in a single write, bypassing the per-call work of the text-mode wrapper
+    with open(filepath, 'wb') as f:
+        for start in range(0, len(commands), _WRITE_CHUNK_COMMANDS):
+            chunk = commands[start:start + _WRITE_CHUNK_COMMANDS]
+            f.write(('\n'.join(chunk) + '\n').encode())
     print(f"Generated {len(commands)} commands -> {filepath}")
 
 
+def generate_emergency_batch(
+    patient_ids: List[str],
+    init_times: List[int],
+    triages: Optional[List[int]] = None,
+    stabilities: Optional[List[int]] = None
+) -> List[str]:
+    """
+    Generate one EMERGENCY command per (patient_id, init_time) pair.
+    
+    Same output as calling generate_emergency() for each pair with the
+    default tests and meds, but the random fields are drawn in batches.
+    
+    Args:
+        patient_ids: Patient ID for each command
+        init_times: Init time for each command
+        triages: Optional triage level per command (random 1-5 otherwise)
+        stabilities: Optional stability per command (random otherwise)
+    
+    Returns:
+        List of command strings
+    """
+    n = len(patient_ids)
+    if triages is None:
+        triages = _choices(range(1, 6), k=n)
+    if stabilities is None:
+        stabilities = _choices(range(100, 1001), k=n)
+    # Per-command list sizes, as in random_tests(max_count=3, exclude_preop=True)
+    # and random_medications(max_count=3)
+    test_counts = _choices(range(min(3, len(TESTS_NO_PREOP)) + 1), k=n)
+    med_counts = _choices(range(min(3, _N_MEDS) + 1), k=n)
+    
+    sample = _sample
+    return [
+        f"EMERGENCY {patient_id} init: {init_time} triage: {triage} "
+        f"stability: {stability} tests: [{','.join(sample(TESTS_NO_PREOP, n_tests))}] "
+        f"meds: [{','.join(sample(MEDICATIONS, n_meds))}]"
+        for patient_id, init_time, triage, stability, n_tests, n_meds
+        in zip(patient_ids, init_times, triages, stabilities, test_counts, med_counts)
+    ]
+
+
 def generate_time_sequence(start: int = 0, count: int = 100, max_gap: int = 5) -> List[int]:
     """
     Generate a sequence of init times with random gaps.
@@ -448,9 +550,8 @@ def generate_time_sequence(start: int = 0, count: int = 100, max_gap: int = 5) -
     Returns:
         List of incrementing timestamps
     """
-    times = []
-    current = start
-    for _ in range(count):
-        times.append(current)
-        current += random.randint(0, max_gap)
-    return times
+    if count <= 0:
+        return []
+    # Draw all gaps at once and let accumulate() build the running sum in C
+    gaps = _choices(range(max_gap + 1), k=count - 1)
+    return list(accumulate(gaps, initial=start))
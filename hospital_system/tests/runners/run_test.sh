@@ -21,6 +21,9 @@ GENERATORS_DIR="$TESTS_DIR/generators"
 GENERATED_DIR="$TESTS_DIR/generated"
 INPUT_PIPE="$PROJECT_DIR/input_pipe"
 
+# Interpreter used for the generators (pure Python, so e.g. PYTHON=pypy3 works)
+PYTHON="${PYTHON:-python3}"
+
 # Colors for output
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -45,11 +48,10 @@ check_pipe() {
     print_msg "$GREEN" "Found input_pipe: $INPUT_PIPE"
 }
 
-# Run a specific generator and inject commands
-run_generator() {
+# Run a generator script (gen_stress_<name>.py)
+generate() {
     local gen_name=$1
     local gen_script="$GENERATORS_DIR/gen_stress_${gen_name}.py"
-    local output_file="$GENERATED_DIR/stress_${gen_name}.txt"
     
     if [ ! -f "$gen_script" ]; then
         print_msg "$RED" "ERROR: Generator not found: $gen_script"
@@ -58,12 +60,15 @@ run_generator() {
     
     print_msg "$BLUE" "Running generator: gen_stress_${gen_name}.py"
     
-    # Ensure generated directory exists
-    mkdir -p "$GENERATED_DIR"
-    
-    # Run the Python generator
-    cd "$TESTS_DIR"
-    python3 "$gen_script"
+    # Run the Python generator as a module of the tests package
+    cd "$PROJECT_DIR"
+    "$PYTHON" -m "tests.generators.gen_stress_${gen_name}"
+}
+
+# Inject a generated command file into the pipe
+inject_commands() {
+    local gen_name=$1
+    local output_file="$GENERATED_DIR/stress_${gen_name}.txt"
     
     if [ ! -f "$output_file" ]; then
         print_msg "$RED" "ERROR: Generated file not found: $output_file"
@@ -82,6 +87,14 @@ run_generator() {
     echo ""
 }
 
+# Run a specific generator and inject commands
+run_generator() {
+    local gen_name=$1
+    
+    generate "$gen_name" || return 1
+    inject_commands "$gen_name"
+}
+
 # Display usage
 usage() {
     echo "Usage: $0 <test_type> [options]"
@@ -98,6 +111,10 @@ usage() {
     echo "  --no-check  - Skip input_pipe existence check"
     echo "  --dry-run   - Generate files but don't inject into pipe"
     echo ""
+    echo "Environment:"
+    echo "  PYTHON      - Interpreter for the generators (default: python3)"
+    echo "  HOSPITAL_SEED - Seed (integer or any string) for reproducible generated commands"
+    echo ""
     echo "Example:"
     echo "  # First, start the hospital system in another terminal:"
     echo "  cd $PROJECT_DIR && ./hospital_system"
@@ -160,13 +177,17 @@ main() {
         all)
             print_msg "$YELLOW" "Running ALL stress tests..."
             echo ""
-            run_generator "triage"
+            # Generate every file in one Python process, then inject them
+            # (stop rather than inject stale files if generation fails)
+            generate "all" || exit 1
+            echo ""
+            inject_commands "triage"
             sleep 2
-            run_generator "surgery"
+            inject_commands "surgery"
             sleep 2
-            run_generator "lab_pharm"
+            inject_commands "lab_pharm"
             sleep 2
-            run_generator "global"
+            inject_commands "global"
             print_msg "$GREEN" "✓ All stress tests completed!"
             ;;
         --help|-h)